@@ -5,23 +5,46 @@ Hide and extract files in PDF documents via CLI
 """
 
 import argparse
+import functools
+import logging
 import sys
 import os
-from pdf_stego import PDFSteganography
+from utils import format_size
 
 
-def format_size(size_bytes):
-    """Format bytes to human-readable size"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+@functools.lru_cache(maxsize=None)
+def get_stego():
+    """Return the shared PDFSteganography instance"""
+    from pdf_stego import PDFSteganography
+    return PDFSteganography()
+
+
+def check_one(pdf_path):
+    """
+    Check one PDF for hidden data using the shared engine
+    
+    Returns:
+        Tuple of (has_hidden_data, (filename, size) or None)
+    """
+    stego = get_stego()
+    if stego.check_hidden_data(pdf_path):
+        return True, stego.get_hidden_file_info(pdf_path)
+    return False, None
+
+
+def check_many(paths):
+    """
+    Check several PDFs for hidden data using the shared engine
+    
+    Returns:
+        List of (pdf_path, has_hidden_data, (filename, size) or None) tuples
+    """
+    return [(pdf_path, *check_one(pdf_path)) for pdf_path in paths]
 
 
 def hide_command(args):
     """Handle hide command"""
-    stego = PDFSteganography()
+    stego = get_stego()
     
     print("=" * 60)
     print("PDF STEGANOGRAPHY - HIDE FILE")
@@ -47,7 +70,7 @@ def hide_command(args):
 
 def extract_command(args):
     """Handle extract command"""
-    stego = PDFSteganography()
+    stego = get_stego()
     
     print("=" * 60)
     print("PDF STEGANOGRAPHY - EXTRACT FILE")
@@ -56,7 +79,8 @@ def extract_command(args):
     print(f"Output directory: {args.output}")
     print("-" * 60)
     
-    # Check if hidden data exists
+    # Check if hidden data exists. The check, info and extract calls below
+    # share the core module's cached lookup, so the PDF is parsed only once
     if not stego.check_hidden_data(args.pdf):
         print("✗ No hidden data found in this PDF")
         print("=" * 60)
@@ -86,28 +110,29 @@ def extract_command(args):
 
 def check_command(args):
     """Handle check command"""
-    stego = PDFSteganography()
-    
     print("=" * 60)
     print("PDF STEGANOGRAPHY - CHECK FILE")
     print("=" * 60)
-    print(f"Checking: {args.pdf}")
-    print("-" * 60)
     
     try:
-        if stego.check_hidden_data(args.pdf):
-            info = stego.get_hidden_file_info(args.pdf)
-            if info:
-                filename, size = info
-                print("✓ Hidden data FOUND")
-                print(f"  Filename: {filename}")
-                print(f"  Size: {format_size(size)}")
+        for pdf_path in args.pdf:
+            # Header first, so anything the check logs appears under it
+            print(f"Checking: {pdf_path}")
+            print("-" * 60)
+            
+            has_data, info = check_one(pdf_path)
+            if has_data:
+                if info:
+                    filename, size = info
+                    print("✓ Hidden data FOUND")
+                    print(f"  Filename: {filename}")
+                    print(f"  Size: {format_size(size)}")
+                else:
+                    print("✓ Hidden data markers found but unable to read info")
             else:
-                print("✓ Hidden data markers found but unable to read info")
-        else:
-            print("✗ No hidden data found")
-        
-        print("=" * 60)
+                print("✗ No hidden data found")
+            
+            print("=" * 60)
         return 0
         
     except Exception as e:
@@ -116,8 +141,8 @@ def check_command(args):
         return 1
 
 
-def main():
-    """Main CLI entry point"""
+def _build_parser():
+    """Build the argument parser for all commands"""
     parser = argparse.ArgumentParser(
         description='PDF Steganography Tool - Hide and extract files in PDF documents',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -131,6 +156,9 @@ Examples:
   
   # Check if PDF contains hidden data
   python cli.py check stego.pdf
+  
+  # Check several PDFs at once
+  python cli.py check a.pdf b.pdf c.pdf
 
 Supported file formats: .txt, .jpg, .png, .pdf, .docx, .exe
         """
@@ -153,14 +181,26 @@ Supported file formats: .txt, .jpg, .png, .pdf, .docx, .exe
     
     # Check command
     check_parser = subparsers.add_parser('check', help='Check if PDF contains hidden data')
-    check_parser.add_argument('pdf', help='PDF file to check')
+    check_parser.add_argument('pdf', nargs='+', help='PDF file(s) to check')
     check_parser.set_defaults(func=check_command)
     
+    return parser
+
+
+# Built once at import time and reused by every main() call
+_PARSER = _build_parser()
+
+
+def main(argv=None):
+    """Main CLI entry point"""
+    # Show the core module's progress messages on stdout
+    logging.basicConfig(stream=sys.stdout, format='%(message)s', level=logging.INFO)
+    
     # Parse arguments
-    args = parser.parse_args()
+    args = _PARSER.parse_args(argv)
     
     if not args.command:
-        parser.print_help()
+        _PARSER.print_help()
         return 0
     
     # Execute command
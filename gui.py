@@ -5,25 +5,66 @@ Graphical User Interface for hiding and extracting files in PDFs
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 import os
 import sys
+import queue
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pdf_stego import PDFSteganography
+from utils import format_size
+
+
+class LogPanelHandler(logging.Handler):
+    """Logging handler that forwards records to the GUI log panel"""
+    
+    def __init__(self, gui):
+        super().__init__()
+        self.gui = gui
+    
+    def emit(self, record):
+        # log_message only queues the line, so this is safe from the worker thread
+        self.gui.log_message(self.format(record))
 
 
 class PDFSteganographyGUI:
     """GUI application for PDF Steganography"""
     
+    # Maximum number of lines kept in the log text widget
+    MAX_TEXT_LINES = 2000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("PDF Steganography Tool")
         self.root.geometry("800x700")
         self.root.resizable(True, True)
         
-        # Initialize steganography engine
+        # Initialize steganography engine (imported here so that importing
+        # this module does not load the core module)
+        from pdf_stego import PDFSteganography
         self.stego = PDFSteganography()
         
+        # Background worker: stego operations run off the Tk main thread,
+        # results come back through task_queue and are handled by _poll_queue
+        self.task_queue = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        
+        # (path, mtime, size) -> (has_hidden_data, hidden_file_info), shared by
+        # the Tk thread and the worker, so guarded by a lock
+        self._info_cache = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+        
+        # Pending log lines, written to log_text in batches by _schedule_log_flush
+        self._log_buf = deque()
+        
+        # Show the core module's progress and error messages in the log panel
+        self.log_handler = LogPanelHandler(self)
+        stego_logger = logging.getLogger('pdf_stego')
+        stego_logger.addHandler(self.log_handler)
+        stego_logger.setLevel(logging.INFO)
+        
         # Configure style
         self.setup_styles()
         
@@ -32,6 +73,11 @@ class PDFSteganographyGUI:
         
         # Center window
         self.center_window()
+        
+        # Start polling for finished background tasks and pending log lines
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._poll_queue()
+        self._schedule_log_flush()
     
     def setup_styles(self):
         """Setup custom styles for widgets"""
@@ -96,7 +142,7 @@ class PDFSteganographyGUI:
         log_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0))
         main_frame.rowconfigure(3, weight=1)
         
-        self.log_text = scrolledtext.ScrolledText(
+        self.log_text = tk.Text(
             log_frame,
             height=8,
             width=70,
@@ -106,6 +152,9 @@ class PDFSteganographyGUI:
             wrap=tk.WORD
         )
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_scrollbar = ttk.Scrollbar(log_frame, command=self.log_text.yview)
+        log_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.log_text.configure(yscrollcommand=log_scrollbar.set)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         
@@ -122,7 +171,7 @@ class PDFSteganographyGUI:
         
         # Initial log message
         self.log_message("=== PDF Steganography Tool Started ===")
-        self.log_message(f"Supported formats: {', '.join(PDFSteganography.SUPPORTED_FORMATS)}")
+        self.log_message(f"Supported formats: {', '.join(self.stego.SUPPORTED_FORMATS_DISPLAY)}")
     
     def create_hide_tab(self):
         """Create the Hide File tab"""
@@ -187,12 +236,13 @@ class PDFSteganographyGUI:
         )
         
         # Hide button
-        ttk.Button(
+        self.hide_button = ttk.Button(
             hide_frame,
             text="🔒 Ẩn File vào PDF",
             style='Action.TButton',
             command=self.hide_file_action
-        ).grid(row=7, column=0, pady=(10, 0))
+        )
+        self.hide_button.grid(row=7, column=0, pady=(10, 0))
         
         hide_frame.columnconfigure(0, weight=1)
     
@@ -248,12 +298,13 @@ class PDFSteganographyGUI:
         self.extract_info_label.grid(row=0, column=0, sticky=tk.W)
         
         # Extract button
-        ttk.Button(
+        self.extract_button = ttk.Button(
             extract_frame,
             text="🔓 Trích xuất File từ PDF",
             style='Action.TButton',
             command=self.extract_file_action
-        ).grid(row=5, column=0, pady=(10, 0))
+        )
+        self.extract_button.grid(row=5, column=0, pady=(10, 0))
         
         extract_frame.columnconfigure(0, weight=1)
     
@@ -280,19 +331,20 @@ class PDFSteganographyGUI:
         )
         
         # Check button
-        ttk.Button(
+        self.check_button = ttk.Button(
             check_frame,
             text="🔍 Kiểm tra PDF",
             style='Action.TButton',
             command=self.check_file_action
-        ).grid(row=2, column=0, pady=(10, 15))
+        )
+        self.check_button.grid(row=2, column=0, pady=(10, 15))
         
         # Result display
         self.check_result_frame = ttk.LabelFrame(check_frame, text="Kết quả kiểm tra", padding="10")
         self.check_result_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         check_frame.rowconfigure(3, weight=1)
         
-        self.check_result_text = scrolledtext.ScrolledText(
+        self.check_result_text = tk.Text(
             self.check_result_frame,
             height=10,
             width=60,
@@ -300,6 +352,9 @@ class PDFSteganographyGUI:
             wrap=tk.WORD
         )
         self.check_result_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        check_scrollbar = ttk.Scrollbar(self.check_result_frame, command=self.check_result_text.yview)
+        check_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.check_result_text.configure(yscrollcommand=check_scrollbar.set)
         self.check_result_frame.columnconfigure(0, weight=1)
         self.check_result_frame.rowconfigure(0, weight=1)
         
@@ -310,22 +365,71 @@ class PDFSteganographyGUI:
     def log_message(self, message):
         """Add message to log output"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        self._log_buf.append(f"[{timestamp}] {message}\n")
+    
+    def _schedule_log_flush(self):
+        """Write pending log lines to the log widget in one batch"""
+        if self._log_buf:
+            # popleft() instead of clear() so lines appended meanwhile are kept
+            pending = []
+            while self._log_buf:
+                pending.append(self._log_buf.popleft())
+            self.log_text.insert(tk.END, ''.join(pending))
+            self.trim_text(self.log_text)
+            self.log_text.see(tk.END)
+        self.root.after(100, self._schedule_log_flush)
+    
+    def trim_text(self, text_widget):
+        """Drop the oldest lines so text_widget holds at most MAX_TEXT_LINES lines"""
+        line_count = int(text_widget.index('end-1c').split('.')[0])
+        if line_count > self.MAX_TEXT_LINES:
+            text_widget.delete('1.0', f'{line_count - self.MAX_TEXT_LINES}.0')
     
     def update_status(self, message):
         """Update status bar"""
         self.status_var.set(message)
-        self.root.update_idletasks()
     
-    def format_size(self, size_bytes):
-        """Format bytes to human-readable size"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} TB"
+    def run_in_background(self, button, on_done, func, *args):
+        """Run func(*args) on the worker thread, then call on_done(future) on the Tk thread"""
+        button.config(state=tk.DISABLED)
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(lambda f: self.task_queue.put((button, on_done, f)))
+    
+    def _poll_queue(self):
+        """Handle finished background tasks (runs on the Tk thread)"""
+        try:
+            while True:
+                button, on_done, future = self.task_queue.get_nowait()
+                button.config(state=tk.NORMAL)
+                on_done(future)
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_queue)
+    
+    def _cached_info(self, path, st=None):
+        """Return (check_hidden_data, get_hidden_file_info) for path, parsing the PDF only once"""
+        if st is None:
+            st = os.stat(path)
+        key = (path, st.st_mtime, st.st_size)
+        with self._info_cache_lock:
+            if key in self._info_cache:
+                self._info_cache.move_to_end(key)
+                return self._info_cache[key]
+        
+        has_data = self.stego.check_hidden_data(path)
+        info = self.stego.get_hidden_file_info(path) if has_data else None
+        
+        with self._info_cache_lock:
+            self._info_cache[key] = (has_data, info)
+            if len(self._info_cache) > 8:
+                self._info_cache.popitem(last=False)
+        return has_data, info
+    
+    def on_close(self):
+        """Stop the worker and close the window"""
+        logging.getLogger('pdf_stego').removeHandler(self.log_handler)
+        self.executor.shutdown(wait=False)
+        self.root.destroy()
     
     # ===== Hide Tab Methods =====
     
@@ -355,8 +459,8 @@ class PDFSteganographyGUI:
         )
         if filename:
             self.hide_file_var.set(filename)
-            size = os.path.getsize(filename)
-            self.log_message(f"Đã chọn file: {os.path.basename(filename)} ({self.format_size(size)})")
+            size = os.stat(filename).st_size
+            self.log_message(f"Đã chọn file: {os.path.basename(filename)} ({format_size(size)})")
     
     def select_hide_output(self):
         """Select output PDF file"""
@@ -393,8 +497,16 @@ class PDFSteganographyGUI:
         self.log_message("Bắt đầu ẩn file vào PDF...")
         self.update_status("Đang xử lý...")
         
+        self.run_in_background(
+            self.hide_button,
+            lambda future: self._hide_done(future, output_path),
+            self.stego.hide_file, pdf_path, file_path, output_path
+        )
+    
+    def _hide_done(self, future, output_path):
+        """Handle the result of a hide operation"""
         try:
-            success = self.stego.hide_file(pdf_path, file_path, output_path)
+            success = future.result()
             
             if success:
                 self.log_message("✓ Hoàn thành!")
@@ -437,11 +549,11 @@ class PDFSteganographyGUI:
     def update_extract_info(self, pdf_path):
         """Update information about hidden file"""
         try:
-            if self.stego.check_hidden_data(pdf_path):
-                info = self.stego.get_hidden_file_info(pdf_path)
+            has_data, info = self._cached_info(pdf_path)
+            if has_data:
                 if info:
                     filename, size = info
-                    info_text = f"✓ Phát hiện file ẩn:\n\nTên file: {filename}\nKích thước: {self.format_size(size)}"
+                    info_text = f"✓ Phát hiện file ẩn:\n\nTên file: {filename}\nKích thước: {format_size(size)}"
                     self.extract_info_label.config(text=info_text, foreground='green')
                 else:
                     self.extract_info_label.config(
@@ -478,8 +590,16 @@ class PDFSteganographyGUI:
         self.log_message("Bắt đầu trích xuất file từ PDF...")
         self.update_status("Đang xử lý...")
         
+        self.run_in_background(
+            self.extract_button,
+            lambda future: self._extract_done(future, output_dir),
+            self.stego.extract_file, pdf_path, output_dir
+        )
+    
+    def _extract_done(self, future, output_dir):
+        """Handle the result of an extract operation"""
         try:
-            extracted_path = self.stego.extract_file(pdf_path, output_dir)
+            extracted_path = future.result()
             
             if extracted_path:
                 self.log_message("✓ Hoàn thành!")
@@ -526,30 +646,53 @@ class PDFSteganographyGUI:
         self.log_message("Đang kiểm tra PDF...")
         self.update_status("Đang kiểm tra...")
         
-        try:
-            result_text = f"File: {os.path.basename(pdf_path)}\n"
-            result_text += f"Đường dẫn: {pdf_path}\n"
-            result_text += f"Kích thước: {self.format_size(os.path.getsize(pdf_path))}\n"
-            result_text += "\n" + "=" * 50 + "\n\n"
-            
-            if self.stego.check_hidden_data(pdf_path):
-                info = self.stego.get_hidden_file_info(pdf_path)
-                if info:
-                    filename, size = info
-                    result_text += "KẾT QUẢ: ✓ PHÁT HIỆN DỮ LIỆU ẨN\n\n"
-                    result_text += f"Tên file ẩn: {filename}\n"
-                    result_text += f"Kích thước file ẩn: {self.format_size(size)}\n"
-                    result_text += f"Định dạng: {os.path.splitext(filename)[1]}\n"
-                    
-                    self.log_message(f"✓ Phát hiện file ẩn: {filename}")
-                else:
-                    result_text += "KẾT QUẢ: ⚠ Phát hiện dữ liệu ẩn nhưng không đọc được thông tin\n"
-                    self.log_message("⚠ Không đọc được thông tin file ẩn")
+        self.run_in_background(
+            self.check_button,
+            self._check_done,
+            self._inspect_pdf, pdf_path
+        )
+    
+    def _inspect_pdf(self, pdf_path):
+        """
+        Check a PDF and build the report (runs on the worker thread)
+        
+        Returns:
+            Tuple of (result_text, log_lines) ready to be displayed
+        """
+        st = os.stat(pdf_path)
+        has_data, info = self._cached_info(pdf_path, st)
+        
+        result_text = f"File: {os.path.basename(pdf_path)}\n"
+        result_text += f"Đường dẫn: {pdf_path}\n"
+        result_text += f"Kích thước: {format_size(st.st_size)}\n"
+        result_text += "\n" + "=" * 50 + "\n\n"
+        
+        if has_data:
+            if info:
+                filename, size = info
+                result_text += "KẾT QUẢ: ✓ PHÁT HIỆN DỮ LIỆU ẨN\n\n"
+                result_text += f"Tên file ẩn: {filename}\n"
+                result_text += f"Kích thước file ẩn: {format_size(size)}\n"
+                result_text += f"Định dạng: {os.path.splitext(filename)[1]}\n"
+                
+                log_lines = [f"✓ Phát hiện file ẩn: {filename}"]
             else:
-                result_text += "KẾT QUẢ: ✗ KHÔNG PHÁT HIỆN DỮ LIỆU ẨN\n\n"
-                result_text += "PDF này không chứa dữ liệu ẩn hoặc chưa được xử lý\nbởi công cụ này."
-                self.log_message("✗ Không phát hiện dữ liệu ẩn")
+                result_text += "KẾT QUẢ: ⚠ Phát hiện dữ liệu ẩn nhưng không đọc được thông tin\n"
+                log_lines = ["⚠ Không đọc được thông tin file ẩn"]
+        else:
+            result_text += "KẾT QUẢ: ✗ KHÔNG PHÁT HIỆN DỮ LIỆU ẨN\n\n"
+            result_text += "PDF này không chứa dữ liệu ẩn hoặc chưa được xử lý\nbởi công cụ này."
+            log_lines = ["✗ Không phát hiện dữ liệu ẩn"]
+        
+        return result_text, log_lines
+    
+    def _check_done(self, future):
+        """Handle the result of a check operation"""
+        try:
+            result_text, log_lines = future.result()
             
+            for line in log_lines:
+                self.log_message(line)
             self.check_result_text.insert(1.0, result_text)
             self.update_status("Kiểm tra hoàn tất")
         
@@ -4,9 +4,42 @@ Hides data files inside PDF files using PDF structure manipulation
 """
 
 import os
+import sys
+import mmap
+import stat
+import logging
+import functools
 import struct
 import base64
-from typing import Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Tuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Precompiled formats for the package length fields and the trailer
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_TRAILER = struct.Struct('<Q8s')
+
+# Trailer written at the very end of the file:
+# [package offset (uint64 LE)][magic (8 bytes)]
+_TRAILER_MAGIC = b"PDFSTEG1"
+_TRAILER_LEN = _TRAILER.size
+
+# Marker constants and their lengths, bound to locals in the hot methods.
+# Markers frame the package in files written by older versions.
+_MARKER = b"<<HIDDEN_DATA_START>>"
+_MARKER_LEN = len(_MARKER)
+_MARKER_END = b"<<HIDDEN_DATA_END>>"
+
+
+class CorruptPackageError(ValueError):
+    """Raised when hidden data is present but its package cannot be parsed"""
+
+
+# Errors the public methods report and turn into a False/None result
+_EXPECTED_ERRORS = (OSError, ValueError, struct.error)
+
 
 class PDFSteganography:
     """
@@ -14,34 +47,245 @@ class PDFSteganography:
     Uses the PDF structure to append hidden data after the %%EOF marker.
     """
     
-    MARKER = b"<<HIDDEN_DATA_START>>"
-    MARKER_END = b"<<HIDDEN_DATA_END>>"
-    SUPPORTED_FORMATS = ['.txt', '.jpg', '.png', '.pdf', '.docx', '.exe']
+    MARKER = _MARKER
+    MARKER_END = _MARKER_END
+    # Ordered for display, the frozenset is used for lookups
+    SUPPORTED_FORMATS_DISPLAY = ('.txt', '.jpg', '.png', '.pdf', '.docx', '.exe')
+    SUPPORTED_FORMATS = frozenset(SUPPORTED_FORMATS_DISPLAY)
+    
+    # Legacy files always end with the end marker, so it is only searched
+    # for in this many trailing bytes
+    TAIL_SCAN_SIZE = 64 * 1024
+    
+    EOF_MARKER = b'%%EOF'
+    # By the PDF spec %%EOF sits in the last few hundred bytes of the file,
+    # it is searched for in growing tail windows before scanning everything
+    EOF_SCAN_SIZES = (4 * 1024, 64 * 1024)
+    # Upper bound for the stored filename, longer values mean a corrupt header
+    MAX_FILENAME_LENGTH = 4096
+    # Largest file the 4-byte data length field can describe
+    MAX_DATA_LENGTH = 0xFFFFFFFF
+    # Chunk size used when streaming file contents
+    COPY_CHUNK_SIZE = 1 << 20
     
     def __init__(self):
         self.pdf_path = None
         self.hidden_file_path = None
     
+    @staticmethod
+    def _open_pdf(pdf_path: str):
+        """
+        Open a PDF for reading after checking its header
+        
+        Returns:
+            Tuple of (file positioned right after the header, None) if valid,
+            (None, error message) otherwise
+        """
+        try:
+            pdf_file = open(pdf_path, 'rb')
+        except FileNotFoundError:
+            return None, f"File not found: {pdf_path}"
+        
+        if pdf_file.read(5) != b'%PDF-':
+            pdf_file.close()
+            return None, "Not a valid PDF file"
+        return pdf_file, None
+    
     @staticmethod
     def validate_pdf(pdf_path: str) -> bool:
         """Validate if the file is a valid PDF"""
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"File not found: {pdf_path}")
-        
-        with open(pdf_path, 'rb') as f:
-            header = f.read(5)
-            if header != b'%PDF-':
-                raise ValueError("Not a valid PDF file")
+        pdf_file, error = PDFSteganography._open_pdf(pdf_path)
+        if error is not None:
+            raise (ValueError if os.path.exists(pdf_path) else FileNotFoundError)(error)
+        pdf_file.close()
         return True
     
     @staticmethod
     def validate_file_format(file_path: str) -> bool:
         """Validate if the file format is supported"""
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext not in PDFSteganography.SUPPORTED_FORMATS:
-            raise ValueError(f"Unsupported file format: {ext}. Supported formats: {', '.join(PDFSteganography.SUPPORTED_FORMATS)}")
+        error = PDFSteganography._check_file_format(file_path)
+        if error is not None:
+            raise ValueError(error)
         return True
     
+    @staticmethod
+    def _check_file_format(file_path: str) -> Optional[str]:
+        """Return an error message if the file format is not supported, None otherwise"""
+        # rpartition scans from the end only; a dot in a directory name or at
+        # the start of the filename is not an extension (same as splitext)
+        head, dot, ext = file_path.rpartition('.')
+        stem = head.rstrip('.')
+        separators = (os.sep, os.altsep or os.sep)
+        if (not dot or not stem or stem[-1] in separators
+                or separators[0] in ext or separators[1] in ext):
+            ext = ''
+        else:
+            ext = '.' + ext.lower()
+        if ext not in PDFSteganography.SUPPORTED_FORMATS:
+            return f"Unsupported file format: {ext}. Supported formats: {', '.join(PDFSteganography.SUPPORTED_FORMATS_DISPLAY)}"
+        return None
+    
+    @classmethod
+    def _find_package(cls, pdf_content) -> Optional[Tuple[int, int]]:
+        """
+        Locate the hidden data package in a PDF buffer
+        
+        Returns:
+            Tuple of (start, end) offsets of the package if found, None otherwise
+        """
+        # Current format: the trailer points straight at the package
+        pdf_size = len(pdf_content)
+        if pdf_size >= _TRAILER_LEN:
+            package_start, magic = _TRAILER.unpack_from(pdf_content, pdf_size - _TRAILER_LEN)
+            if magic == _TRAILER_MAGIC and package_start <= pdf_size - _TRAILER_LEN:
+                return (package_start, pdf_size - _TRAILER_LEN)
+        
+        # Legacy format: the package is framed by markers
+        MARKER = _MARKER
+        MLEN = _MARKER_LEN
+        
+        end_pos = cls._rfind_from(pdf_content, _MARKER_END, max(0, len(pdf_content) - cls.TAIL_SCAN_SIZE))
+        if end_pos == -1:
+            return None
+        
+        # The marker searches below may span the whole buffer, a memoryview
+        # is copied once for them since it has no search methods
+        if isinstance(pdf_content, memoryview):
+            pdf_content = pdf_content.tobytes()
+        
+        # Search backwards from the end marker so only the package itself is
+        # scanned. The payload may contain markers of its own (e.g. a hidden
+        # PDF with hidden data), so keep going back until the lengths add up.
+        start_pos = pdf_content.rfind(MARKER, 0, end_pos)
+        while start_pos != -1:
+            package_start = start_pos + MLEN
+            try:
+                _, data_offset, data_length = cls._parse_package_header(pdf_content, package_start, end_pos)
+                if data_offset + data_length == end_pos:
+                    return (package_start, end_pos)
+            except ValueError:
+                pass
+            start_pos = pdf_content.rfind(MARKER, 0, start_pos)
+        
+        # No consistent package, report the outermost one so callers can
+        # detect the corruption
+        start_pos = pdf_content.find(MARKER, 0, end_pos)
+        if start_pos == -1:
+            return None
+        
+        return (start_pos + MLEN, end_pos)
+    
+    @staticmethod
+    def _rfind_from(buf, sub: bytes, start: int) -> int:
+        """buf.rfind(sub, start) that also works on a memoryview by searching a copy of the tail"""
+        if isinstance(buf, memoryview):
+            pos = buf[start:].tobytes().rfind(sub)
+            return pos if pos == -1 else start + pos
+        return buf.rfind(sub, start)
+    
+    @classmethod
+    def _parse_package_header(cls, pdf_content, start: int, end: int) -> Tuple[str, int, int]:
+        """
+        Parse the package header found between start and end
+        
+        Returns:
+            Tuple of (filename, data_offset, data_length)
+        """
+        # Lengths are checked before slicing or decoding, so a corrupt header
+        # is rejected without touching a huge range of the file
+        if end - start < 8:
+            raise CorruptPackageError("Data corruption detected: hidden package is too short")
+        
+        # Read filename length
+        filename_length, = _U32.unpack_from(pdf_content, start)
+        if filename_length > cls.MAX_FILENAME_LENGTH or start + 8 + filename_length > end:
+            raise CorruptPackageError("Data corruption detected: invalid filename length")
+        
+        # Read filename
+        # str() decodes any buffer, a memoryview slice has no decode method
+        try:
+            filename = str(pdf_content[start+4:start+4+filename_length], 'utf-8')
+        except UnicodeDecodeError:
+            raise CorruptPackageError("Data corruption detected: invalid filename encoding") from None
+        
+        # Read data length
+        data_length_pos = start + 4 + filename_length
+        data_length, = _U32.unpack_from(pdf_content, data_length_pos)
+        if data_length > end - (data_length_pos + 4):
+            raise CorruptPackageError("Data corruption detected: extracted data length mismatch")
+        
+        return (filename, data_length_pos + 4, data_length)
+    
+    @staticmethod
+    def _locate(pdf_path: str) -> Tuple[Optional[str], Optional[Tuple[str, int, int]]]:
+        """Cached lookup of (error, (filename, data_offset, data_length)) for a PDF, see _locate_hidden"""
+        try:
+            st = os.stat(pdf_path)
+        except FileNotFoundError:
+            return f"File not found: {pdf_path}", None
+        return _locate_hidden(pdf_path, st.st_mtime_ns, st.st_size)
+    
+    def _find_eof_end(self, pdf_file) -> int:
+        """
+        Find the end of the last %%EOF marker in an open PDF
+        
+        Returns:
+            Offset just past the marker, or -1 if there is none
+        """
+        pdf_size = os.fstat(pdf_file.fileno()).st_size
+        
+        # Fast path: only read the tail of the file
+        for scan_size in self.EOF_SCAN_SIZES:
+            tail_start = max(0, pdf_size - scan_size)
+            pdf_file.seek(tail_start)
+            eof_position = pdf_file.read().rfind(self.EOF_MARKER)
+            if eof_position != -1:
+                return tail_start + eof_position + len(self.EOF_MARKER)
+            if tail_start == 0:
+                return -1
+        
+        # Something large follows %%EOF, fall back to scanning the whole file
+        with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_content:
+            eof_position = pdf_content.rfind(self.EOF_MARKER)
+        if eof_position == -1:
+            return -1
+        return eof_position + len(self.EOF_MARKER)
+    
+    def _copy_range(self, src, dst, length: int) -> None:
+        """Copy the first length bytes of src to the current position of dst"""
+        dst.flush()
+        
+        # Large copies read src front to back, let the kernel read ahead aggressively
+        if length >= self.COPY_CHUNK_SIZE and hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(src.fileno(), 0, length, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        
+        if sys.platform.startswith('linux'):
+            # Zero-copy path, data does not pass through user space
+            offset = 0
+            try:
+                while offset < length:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, length - offset)
+                    if sent == 0:
+                        raise ValueError("Unexpected end of file while copying")
+                    offset += sent
+                return
+            except OSError:
+                # Some file systems do not support sendfile, copy in user space
+                if offset:
+                    raise
+        
+        src.seek(0)
+        remaining = length
+        while remaining:
+            chunk = src.read(min(self.COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ValueError("Unexpected end of file while copying")
+            dst.write(chunk)
+            remaining -= len(chunk)
+    
     def hide_file(self, pdf_path: str, file_to_hide: str, output_path: str) -> bool:
         """
         Hide a file inside a PDF document
@@ -55,20 +299,18 @@ class PDFSteganography:
             True if successful, False otherwise
         """
         try:
-            # Validate inputs
-            self.validate_pdf(pdf_path)
-            self.validate_file_format(file_to_hide)
-            
-            if not os.path.exists(file_to_hide):
-                raise FileNotFoundError(f"File to hide not found: {file_to_hide}")
-            
-            # Read the PDF content
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-            
-            # Read the file to hide
-            with open(file_to_hide, 'rb') as hidden_file:
-                hidden_data = hidden_file.read()
+            # Validate inputs, keeping the validated PDF open for the copy below
+            pdf_file, error = self._open_pdf(pdf_path)
+            if error is None:
+                error = self._check_file_format(file_to_hide)
+            if error is None and not os.path.exists(file_to_hide):
+                error = f"File to hide not found: {file_to_hide}"
+            
+            if error is not None:
+                if pdf_file is not None:
+                    pdf_file.close()
+                logger.error("✗ Error hiding file: %s", error)
+                return False
             
             # Get original filename and extension
             original_filename = os.path.basename(file_to_hide)
@@ -76,47 +318,82 @@ class PDFSteganography:
             # Prepare metadata
             filename_bytes = original_filename.encode('utf-8')
             filename_length = len(filename_bytes)
-            data_length = len(hidden_data)
-            
-            # Create the hidden data package
-            # Format: [filename_length(4 bytes)][filename][data_length(4 bytes)][data]
-            hidden_package = (
-                struct.pack('<I', filename_length) +
-                filename_bytes +
-                struct.pack('<I', data_length) +
-                hidden_data
-            )
             
-            # Find the last %%EOF marker
-            eof_marker = b'%%EOF'
-            eof_position = pdf_content.rfind(eof_marker)
-            
-            if eof_position == -1:
-                raise ValueError("Invalid PDF: %%EOF marker not found")
-            
-            # Insert hidden data after %%EOF
-            # Keep everything up to and including %%EOF, then add hidden data
-            modified_pdf = (
-                pdf_content[:eof_position + len(eof_marker)] +
-                b'\n' +
-                self.MARKER +
-                hidden_package +
-                self.MARKER_END +
-                b'\n'
-            )
-            
-            # Write the output file
-            with open(output_path, 'wb') as output_file:
-                output_file.write(modified_pdf)
-            
-            print(f"✓ Successfully hidden '{original_filename}' ({data_length} bytes) in PDF")
-            print(f"✓ Output saved to: {output_path}")
+            # The output is written to a temporary file next to the real output
+            # (through any symlink) and moved in place on success. A failure never
+            # leaves a partial PDF behind or destroys an existing output file, and
+            # the output may be one of the inputs
+            target_path = os.path.realpath(output_path)
+            tmp_path = None
+            try:
+                # Both inputs are streamed into the output, never read fully into memory
+                with pdf_file, open(file_to_hide, 'rb') as hidden_file:
+                    data_length = os.fstat(hidden_file.fileno()).st_size
+                    
+                    # Find the last %%EOF marker
+                    eof_end = self._find_eof_end(pdf_file)
+                    
+                    if eof_end == -1:
+                        logger.error("✗ Error hiding file: Invalid PDF: %%EOF marker not found")
+                        return False
+                    
+                    if data_length > self.MAX_DATA_LENGTH:
+                        logger.error("✗ Error hiding file: File to hide is too large (max %d bytes)",
+                                     self.MAX_DATA_LENGTH)
+                        return False
+                    
+                    # Keep everything up to and including %%EOF, then add hidden data
+                    # Package format: [filename_length(4 bytes)][filename][data_length(4 bytes)][data]
+                    # followed by the trailer pointing at the package
+                    package_offset = eof_end + 1
+                    header = b''.join((b'\n', _U32.pack(filename_length), filename_bytes, _U32.pack(data_length)))
+                    trailer = _TRAILER.pack(package_offset, _TRAILER_MAGIC)
+                    
+                    tmp_path, tmp_fd = self._create_temp(target_path)
+                    with os.fdopen(tmp_fd, 'wb') as output_file:
+                        self._copy_range(pdf_file, output_file, eof_end)
+                        output_file.write(header)
+                        self._copy_range(hidden_file, output_file, data_length)
+                        output_file.write(trailer)
+                
+                # All files are closed by now, Windows cannot replace an open file.
+                # An existing output keeps its permissions
+                try:
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(target_path).st_mode))
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp_path, target_path)
+            except BaseException:
+                if tmp_path is not None:
+                    os.unlink(tmp_path)
+                raise
+            
+            logger.info("✓ Successfully hidden '%s' (%d bytes) in PDF", original_filename, data_length)
+            logger.info("✓ Output saved to: %s", output_path)
             return True
             
-        except Exception as e:
-            print(f"✗ Error hiding file: {str(e)}")
+        except _EXPECTED_ERRORS as e:
+            logger.error("✗ Error hiding file: %s", e)
             return False
     
+    @staticmethod
+    def _create_temp(output_path: str) -> Tuple[str, int]:
+        """
+        Exclusively create a temporary file in the directory of output_path
+        
+        Returns:
+            Tuple of (temporary path, open file descriptor)
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        counter = 0
+        while True:
+            tmp_path = f"{output_path}.{os.getpid()}.{counter}.tmp"
+            try:
+                # Same permissions as a plain open(output_path, 'wb')
+                return tmp_path, os.open(tmp_path, flags, 0o666)
+            except FileExistsError:
+                counter += 1
+    
     def extract_file(self, pdf_path: str, output_dir: str) -> Optional[str]:
         """
         Extract hidden file from a PDF document
@@ -129,40 +406,20 @@ class PDFSteganography:
             Path to the extracted file if successful, None otherwise
         """
         try:
-            # Validate PDF
-            self.validate_pdf(pdf_path)
+            # Locate the hidden data (validates the PDF)
+            error, location = self._locate(pdf_path)
+            if error is None and location is None:
+                error = "No hidden data found in this PDF"
+            if error is not None:
+                logger.error("✗ Error extracting file: %s", error)
+                return None
+            filename, data_start_pos, data_length = location
             
-            # Read the PDF content
+            # Read only the hidden data, its length was validated with the header
             with open(pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-            
-            # Find the hidden data markers
-            start_pos = pdf_content.find(self.MARKER)
-            end_pos = pdf_content.find(self.MARKER_END)
-            
-            if start_pos == -1 or end_pos == -1:
-                raise ValueError("No hidden data found in this PDF")
-            
-            # Extract the hidden package
-            start_pos += len(self.MARKER)
-            hidden_package = pdf_content[start_pos:end_pos]
-            
-            # Parse the hidden package
-            # Read filename length
-            filename_length = struct.unpack('<I', hidden_package[0:4])[0]
-            
-            # Read filename
-            filename = hidden_package[4:4+filename_length].decode('utf-8')
-            
-            # Read data length
-            data_length_pos = 4 + filename_length
-            data_length = struct.unpack('<I', hidden_package[data_length_pos:data_length_pos+4])[0]
+                pdf_file.seek(data_start_pos)
+                hidden_data = pdf_file.read(data_length)
             
-            # Read hidden data
-            data_start_pos = data_length_pos + 4
-            hidden_data = hidden_package[data_start_pos:data_start_pos+data_length]
-            
-            # Validate extracted data length
             if len(hidden_data) != data_length:
                 raise ValueError("Data corruption detected: extracted data length mismatch")
             
@@ -172,22 +429,118 @@ class PDFSteganography:
             # Write the extracted file
             output_path = os.path.join(output_dir, filename)
             
-            # Handle duplicate filenames
+            # Handle duplicate filenames: create the file exclusively, so each
+            # probe is a single syscall and no other process can race us. A name
+            # that resolves to a directory (an empty stored filename gives
+            # output_dir itself) falls through to the numbered names as well
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
             counter = 1
             base_name, ext = os.path.splitext(filename)
-            while os.path.exists(output_path):
-                output_path = os.path.join(output_dir, f"{base_name}_{counter}{ext}")
-                counter += 1
-            
-            with open(output_path, 'wb') as output_file:
+            fd = None
+            while fd is None:
+                try:
+                    fd = os.open(output_path, flags, 0o644)
+                except (FileExistsError, IsADirectoryError):
+                    output_path = os.path.join(output_dir, f"{base_name}_{counter}{ext}")
+                    counter += 1
+            
+            with os.fdopen(fd, 'wb') as output_file:
                 output_file.write(hidden_data)
             
-            print(f"✓ Successfully extracted '{filename}' ({data_length} bytes)")
-            print(f"✓ Saved to: {output_path}")
+            logger.info("✓ Successfully extracted '%s' (%d bytes)", filename, data_length)
+            logger.info("✓ Saved to: %s", output_path)
             return output_path
             
-        except Exception as e:
-            print(f"✗ Error extracting file: {str(e)}")
+        except _EXPECTED_ERRORS as e:
+            logger.error("✗ Error extracting file: %s", e)
+            return None
+    
+    def hide_data(self, pdf_bytes: bytes, secret_bytes: bytes, filename: str) -> Optional[bytearray]:
+        """
+        Hide data inside an in-memory PDF document, without any disk I/O
+        
+        Args:
+            pdf_bytes: Content of the cover PDF (bytes, bytearray or memoryview)
+            secret_bytes: Data to be hidden (bytes, bytearray or memoryview)
+            filename: Filename stored with the hidden data
+            
+        Returns:
+            Content of the output PDF as a mutable bytearray if successful,
+            None otherwise. It is built in place to avoid a final copy, use
+            bytes() on it where an immutable or hashable value is needed
+        """
+        try:
+            # Validate inputs
+            error = None if pdf_bytes[:5] == b'%PDF-' else "Not a valid PDF file"
+            if error is None:
+                error = self._check_file_format(filename)
+            if error is not None:
+                logger.error("✗ Error hiding data: %s", error)
+                return None
+            
+            filename_bytes = os.path.basename(filename).encode('utf-8')
+            
+            # Find the last %%EOF marker, looking at the tail first
+            eof_position = -1
+            for scan_size in self.EOF_SCAN_SIZES + (len(pdf_bytes),):
+                eof_position = self._rfind_from(pdf_bytes, self.EOF_MARKER, max(0, len(pdf_bytes) - scan_size))
+                if eof_position != -1:
+                    break
+            
+            if eof_position == -1:
+                logger.error("✗ Error hiding data: Invalid PDF: %%EOF marker not found")
+                return None
+            
+            # Same layout as hide_file, written into a single preallocated
+            # buffer so the cover PDF is copied exactly once
+            eof_end = eof_position + len(self.EOF_MARKER)
+            pieces = (
+                memoryview(pdf_bytes)[:eof_end],
+                b'\n',
+                _U32.pack(len(filename_bytes)),
+                filename_bytes,
+                _U32.pack(len(secret_bytes)),
+                secret_bytes,
+                _U64.pack(eof_end + 1),
+                _TRAILER_MAGIC,
+            )
+            output = bytearray(sum(len(piece) for piece in pieces))
+            output_view = memoryview(output)
+            pos = 0
+            for piece in pieces:
+                output_view[pos:pos+len(piece)] = piece
+                pos += len(piece)
+            return output
+        
+        except _EXPECTED_ERRORS as e:
+            logger.error("✗ Error hiding data: %s", e)
+            return None
+    
+    def extract_data(self, pdf_bytes: bytes) -> Optional[Tuple[str, bytes]]:
+        """
+        Extract hidden data from an in-memory PDF document, without any disk I/O
+        
+        Args:
+            pdf_bytes: Content of the PDF with hidden data (bytes, bytearray or memoryview)
+            
+        Returns:
+            Tuple of (filename, data as bytes) if successful, None otherwise
+        """
+        try:
+            if pdf_bytes[:5] != b'%PDF-':
+                logger.error("✗ Error extracting data: Not a valid PDF file")
+                return None
+            
+            bounds = self._find_package(pdf_bytes)
+            if bounds is None:
+                logger.error("✗ Error extracting data: No hidden data found in this PDF")
+                return None
+            
+            filename, data_offset, data_length = self._parse_package_header(pdf_bytes, *bounds)
+            return (filename, memoryview(pdf_bytes)[data_offset:data_offset+data_length].tobytes())
+        
+        except _EXPECTED_ERRORS as e:
+            logger.error("✗ Error extracting data: %s", e)
             return None
     
     def check_hidden_data(self, pdf_path: str) -> bool:
@@ -201,16 +554,37 @@ class PDFSteganography:
             True if hidden data exists, False otherwise
         """
         try:
-            self.validate_pdf(pdf_path)
-            
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-            
-            return self.MARKER in pdf_content and self.MARKER_END in pdf_content
+            error, location = self._locate(pdf_path)
+        
+        except CorruptPackageError:
+            # The data is there even though it cannot be read
+            return True
             
-        except Exception as e:
-            print(f"✗ Error checking PDF: {str(e)}")
+        except _EXPECTED_ERRORS as e:
+            error = str(e)
+        
+        if error is not None:
+            logger.error("✗ Error checking PDF: %s", error)
             return False
+        return location is not None
+    
+    def check_hidden_data_many(self, pdf_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Check several PDFs for hidden data in parallel
+        
+        Each check only touches the end of the file and is dominated by file
+        I/O, which releases the GIL, so the checks overlap across threads.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            max_workers: Number of worker threads, defaults to the CPU count
+            
+        Returns:
+            Dict mapping each path to True if it contains hidden data
+        """
+        pdf_paths = list(pdf_paths)
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return dict(zip(pdf_paths, executor.map(self.check_hidden_data, pdf_paths)))
     
     def get_hidden_file_info(self, pdf_path: str) -> Optional[Tuple[str, int]]:
         """
@@ -223,37 +597,46 @@ class PDFSteganography:
             Tuple of (filename, file_size) if hidden data exists, None otherwise
         """
         try:
-            self.validate_pdf(pdf_path)
+            error, location = self._locate(pdf_path)
             
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-            
-            start_pos = pdf_content.find(self.MARKER)
-            end_pos = pdf_content.find(self.MARKER_END)
-            
-            if start_pos == -1 or end_pos == -1:
-                return None
-            
-            start_pos += len(self.MARKER)
-            hidden_package = pdf_content[start_pos:end_pos]
-            
-            # Read filename length and filename
-            filename_length = struct.unpack('<I', hidden_package[0:4])[0]
-            filename = hidden_package[4:4+filename_length].decode('utf-8')
-            
-            # Read data length
-            data_length_pos = 4 + filename_length
-            data_length = struct.unpack('<I', hidden_package[data_length_pos:data_length_pos+4])[0]
-            
-            return (filename, data_length)
-            
-        except Exception as e:
-            print(f"✗ Error reading hidden file info: {str(e)}")
+        except _EXPECTED_ERRORS as e:
+            error = str(e)
+        
+        if error is not None:
+            logger.error("✗ Error reading hidden file info: %s", error)
             return None
+        if location is None:
+            return None
+        
+        filename, _, data_length = location
+        return (filename, data_length)
+
+
+@functools.lru_cache(maxsize=32)
+def _locate_hidden(pdf_path: str, mtime_ns: int, size: int) -> Tuple[Optional[str], Optional[Tuple[str, int, int]]]:
+    """
+    Validate a PDF and locate its hidden data
+    
+    mtime_ns and size are only part of the cache key, so a modified file is
+    parsed again. Only the header is read, the hidden data is never touched.
+    
+    Returns:
+        Tuple of (error message or None, (filename, data_offset, data_length)
+        if hidden data exists else None)
+    """
+    pdf_file, error = PDFSteganography._open_pdf(pdf_path)
+    if error is not None:
+        return error, None
+    
+    with pdf_file, mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_content:
+        bounds = PDFSteganography._find_package(pdf_content)
+        if bounds is None:
+            return None, None
+        return None, PDFSteganography._parse_package_header(pdf_content, *bounds)
 
 
 if __name__ == "__main__":
     # Simple test
     stego = PDFSteganography()
     print("PDF Steganography Tool - Core Module")
-    print(f"Supported formats: {', '.join(PDFSteganography.SUPPORTED_FORMATS)}")
+    print(f"Supported formats: {', '.join(PDFSteganography.SUPPORTED_FORMATS_DISPLAY)}")
@@ -5,6 +5,7 @@ Run this script to see the tool in action
 
 import os
 import sys
+import logging
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,6 +18,20 @@ def print_header(text):
     print(f"  {text}")
     print("=" * 70)
 
+def files_equal(path1, path2, chunk_size=1 << 20):
+    """Compare two files chunk by chunk without loading them into memory"""
+    if os.path.getsize(path1) != os.path.getsize(path2):
+        return False
+    
+    with open(path1, 'rb') as f1, open(path2, 'rb') as f2:
+        while True:
+            chunk1 = f1.read(chunk_size)
+            chunk2 = f2.read(chunk_size)
+            if chunk1 != chunk2:
+                return False
+            if not chunk1:
+                return True
+
 def demo_hide_and_extract():
     """Demonstrate hiding and extracting a file"""
     
@@ -99,13 +114,7 @@ def demo_hide_and_extract():
         # Verify integrity
         print("\n🔬 Verifying file integrity...")
         
-        with open(secret_file, 'rb') as f1:
-            original_data = f1.read()
-        
-        with open(extracted_path, 'rb') as f2:
-            extracted_data = f2.read()
-        
-        if original_data == extracted_data:
+        if files_equal(secret_file, extracted_path):
             print("✅ File integrity verified! Files are identical.")
         else:
             print("❌ Warning: Files are different!")
@@ -137,6 +146,8 @@ def demo_hide_and_extract():
     print("\n" + "=" * 70 + "\n")
 
 if __name__ == "__main__":
+    # Show the core module's progress messages on stdout
+    logging.basicConfig(stream=sys.stdout, format='%(message)s', level=logging.INFO)
     try:
         demo_hide_and_extract()
     except Exception as e:
@@ -0,0 +1,14 @@
+"""
+PDF Steganography Tool - Shared Helpers
+Small helpers used by both the CLI and the GUI
+"""
+
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def format_size(size_bytes):
+    """Format bytes to human-readable size"""
+    # Each unit is 2**10 times the previous one, so the unit index is bit_length // 10.
+    # Only the index uses the integer part, floats are still formatted as given
+    idx = min(max(int(size_bytes), 1).bit_length() - 1, 40) // 10
+    return f"{size_bytes / (1 << (idx * 10)):.2f} {_UNITS[idx]}"